@@ -0,0 +1,205 @@
+import streamlit as st
+import pandas as pd
+import os
+import re
+import pyarrow as pa
+from data_io import (
+    PURCHASES_SCHEMA, SALES_SCHEMA, INVENTORY_SCHEMA, load_parquet, save_parquet,
+    migrate_csv, init_dataset, load_dataset, save_dataset, append_row, loaded_mtime
+)
+
+# --- MODERN UI STYLING (shared by app.py and all pages) ---
+CSS = """
+    /* Main app background */
+    .stApp {
+        background-color: #f0f2f6;
+    }
+
+    /* Card-like containers */
+    .stMetric, .stDataFrame, [data-testid="stExpander"], [data-testid="stForm"] {
+        border-radius: 10px;
+        padding: 20px !important;
+        background-color: #ffffff;
+        box-shadow: 0 4px 8px rgba(0,0,0,0.1);
+        border: 1px solid #e6e6e6;
+    }
+
+    [data-testid="stMetric"] {
+        padding: 20px !important;
+    }
+
+    /* Metric label styling */
+    [data-testid="stMetricLabel"] {
+        font-size: 1.1rem;
+        color: #4a4a4a;
+        font-weight: 600;
+    }
+
+    /* Main titles - Use !important to override default themes */
+    h1, h2, h3 {
+        color: #1a2a6c !important;
+    }
+
+    /* Ensure markdown text is also readable */
+    .stMarkdown p {
+        color: #333333 !important;
+    }
+
+    /* Expander styling */
+    [data-testid="stExpander"] {
+        background-color: #fafafa;
+    }
+    [data-testid="stExpander"] > summary > div > p {
+        font-weight: 600;
+        color: #1a2a6c !important;
+    }
+
+    /* Buttons */
+    .stButton>button {
+        background-color: #1a2a6c;
+        color: white;
+        border-radius: 5px;
+        padding: 10px 20px;
+        border: none;
+        font-weight: bold;
+    }
+    .stButton>button:hover {
+        background-color: #293d8b;
+    }
+
+    /* Sale price preview box */
+    .price-display {
+        background-color: #e6f7ff;
+        border-left: 5px solid #1a2a6c;
+        padding: 15px;
+        border-radius: 5px;
+        margin-top: 10px;
+    }
+"""
+
+def _minify_css(css):
+    """Strips comments and redundant whitespace from a stylesheet."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};:,>])\s*", r"\1", css).strip()
+
+# Built once per process; Streamlit drops elements that aren't re-sent,
+# so the style tag itself still has to be emitted on every rerun
+STYLE_TAG = f"<style>{_minify_css(CSS)}</style>"
+
+def inject_css():
+    """Applies the shared app styling. Call right after st.set_page_config()."""
+    st.markdown(STYLE_TAG, unsafe_allow_html=True)
+
+def toast_after_rerun(message, icon="✅"):
+    """Queues a toast for the next run, so it is still shown after st.rerun()."""
+    st.session_state.setdefault('_pending_toasts', []).append((message, icon))
+
+def show_pending_toasts():
+    """Shows toasts queued by toast_after_rerun() during the previous run."""
+    for message, icon in st.session_state.pop('_pending_toasts', []):
+        st.toast(message, icon=icon)
+
+
+# --- CORE DATA & CONSTANTS ---
+# Standard densities (kg/Litre) to convert MT to Litres. 1 MT = 1000kg.
+OIL_DENSITIES = {
+    "Crude Degummed Oil": 0.92,
+    "Palm Oil": 0.915,
+    "Palm Degummed": 0.918,
+    "Crude Sunflower Oil": 0.922
+}
+OIL_TYPES = list(OIL_DENSITIES.keys())
+TRANSPORT_COST_PER_KM = 12
+IGST_RATE = 0.05 # 5%
+
+# Longer logs are trimmed to their most recent rows before going into st.data_editor
+MAX_EDITOR_ROWS = 1000
+
+# --- DATA FILE MANAGEMENT ---
+DATA_DIR = "data"
+PURCHASES_DIR = os.path.join(DATA_DIR, "purchases")
+SALES_DIR = os.path.join(DATA_DIR, "sales")
+INVENTORY_FILE = os.path.join(DATA_DIR, "inventory.parquet")
+
+def initialize_data_files():
+    """Creates the data directory and necessary data files if they don't exist."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    # Older versions of the app kept single CSV or Parquet files; import them once
+    init_dataset(PURCHASES_DIR, PURCHASES_SCHEMA, legacy_files=[
+        os.path.join(DATA_DIR, "purchases.parquet"), os.path.join(DATA_DIR, "purchases.csv")
+    ])
+    init_dataset(SALES_DIR, SALES_SCHEMA, legacy_files=[
+        os.path.join(DATA_DIR, "sales.parquet"), os.path.join(DATA_DIR, "sales.csv")
+    ])
+    migrate_csv(os.path.join(DATA_DIR, "inventory.csv"), INVENTORY_FILE, INVENTORY_SCHEMA)
+    if not os.path.exists(INVENTORY_FILE):
+        inventory_df = pd.DataFrame({
+            "OilType": [oil for oil in OIL_TYPES for _ in (0, 1)],
+            "InventoryType": ["Crude", "Refined"] * len(OIL_TYPES),
+            "QuantityMT": [0.0] * len(OIL_TYPES) * 2
+        })
+        save_parquet(inventory_df, INVENTORY_FILE, INVENTORY_SCHEMA)
+
+def ensure_data_files():
+    """
+    Runs initialize_data_files() once per session. Called by app.py and every page before
+    loading data, so a page opened directly (bookmark, refresh) also migrates legacy files.
+    """
+    if st.session_state.get('_data_init'):
+        return
+    try:
+        initialize_data_files()
+    except (pa.ArrowInvalid, pa.ArrowTypeError, KeyError, ValueError) as e:
+        # Nothing is marked as initialised, so the import is retried on the next run
+        st.error(f"Could not import existing data files from '{DATA_DIR}': {e}")
+        st.stop()
+    st.session_state['_data_init'] = True
+
+# --- HELPER FUNCTIONS ---
+
+def load_purchases():
+    """Loads the purchases log into a DataFrame."""
+    return load_dataset(PURCHASES_DIR, PURCHASES_SCHEMA)
+
+def load_sales():
+    """Loads the sales orders log into a DataFrame."""
+    return load_dataset(SALES_DIR, SALES_SCHEMA)
+
+def load_inventory():
+    """Loads the inventory data into a DataFrame."""
+    return load_parquet(INVENTORY_FILE)
+
+def inventory_mtime():
+    """Modification time of the inventory file as of the last load_inventory() call."""
+    return loaded_mtime(INVENTORY_FILE)
+
+def save_data(purchases_df=None, sales_df=None, inventory_df=None):
+    """Saves updated DataFrames back to their Parquet files."""
+    if purchases_df is not None:
+        save_dataset(purchases_df, PURCHASES_DIR, PURCHASES_SCHEMA)
+    if sales_df is not None:
+        save_dataset(sales_df, SALES_DIR, SALES_SCHEMA)
+    if inventory_df is not None:
+        save_parquet(inventory_df, INVENTORY_FILE, INVENTORY_SCHEMA)
+
+def recent_rows(df, label):
+    """
+    Returns the most recent rows of a log for display. Logs longer than MAX_EDITOR_ROWS
+    get a "rows to show" input and a warning that older rows are hidden.
+    """
+    if len(df) <= MAX_EDITOR_ROWS:
+        return df
+    rows_to_show = st.number_input(
+        f"{label} to show", min_value=100, max_value=len(df), value=MAX_EDITOR_ROWS, step=100
+    )
+    st.warning(f"Showing the last {rows_to_show} of {len(df)} {label.lower()}.")
+    return df.tail(rows_to_show)
+
+def append_purchase(purchase):
+    """Appends one purchase (a dict of column values) to the purchases log."""
+    append_row(PURCHASES_DIR, purchase, PURCHASES_SCHEMA)
+
+def append_sale(sale):
+    """Appends one sales order (a dict of column values) to the sales log."""
+    append_row(SALES_DIR, sale, SALES_SCHEMA)
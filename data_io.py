@@ -0,0 +1,160 @@
+import glob
+import os
+import shutil
+import time
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+import streamlit as st
+
+
+# --- DATASET SCHEMAS ---
+# Purchases and sales are append-only logs stored as Parquet datasets (a directory
+# of file fragments). A fixed schema keeps every fragment readable as one table.
+# Dates are stored as timestamps, so they load as datetime64 without any parsing.
+PURCHASES_SCHEMA = pa.schema([
+    ("ShipmentID", pa.string()), ("OilType", pa.string()), ("QuantityMT", pa.float64()),
+    ("PricePerMT", pa.float64()), ("TotalCost", pa.float64()), ("PurchaseDate", pa.timestamp("ns")),
+    ("Status", pa.string()), ("Supplier", pa.string())
+])
+SALES_SCHEMA = pa.schema([
+    ("OrderID", pa.string()), ("VendorName", pa.string()), ("Destination", pa.string()),
+    ("DistanceKM", pa.int64()), ("OilType", pa.string()), ("QuantityMT", pa.float64()),
+    ("SalePrice", pa.float64()), ("OrderDate", pa.timestamp("ns")), ("Status", pa.string())
+])
+# Inventory is a single small Parquet file, rewritten in full on every change
+INVENTORY_SCHEMA = pa.schema([
+    ("OilType", pa.string()), ("InventoryType", pa.string()), ("QuantityMT", pa.float64())
+])
+
+# Low-cardinality text columns that are loaded as pandas categoricals.
+# Status is left as plain text: it is the column users edit in st.data_editor.
+CATEGORY_COLUMNS = ["OilType", "InventoryType", "Supplier"]
+
+
+# --- CACHED FILE I/O (shared by app.py and all pages) ---
+
+@st.cache_data(show_spinner=False)
+def _read_parquet(path, mtime, _schema=None):
+    """
+    Reads a Parquet file or dataset directory into a DataFrame.
+    `mtime` is only used as part of the cache key, so a changed file is re-read.
+    """
+    df = pq.read_table(path, schema=_schema).to_pandas()
+    return df.astype({col: "category" for col in CATEGORY_COLUMNS if col in df.columns})
+
+def get_state_df(key, path, schema=None):
+    """
+    Returns the DataFrame for `path`, kept in st.session_state under `key`.
+    It is only re-read when the file's mtime changes, so widget-driven reruns skip I/O.
+    """
+    mtime = os.path.getmtime(path)
+    if st.session_state.get(key + "_mt") != mtime:
+        st.session_state[key] = _read_parquet(path, mtime, schema)
+        st.session_state[key + "_mt"] = mtime
+    return st.session_state[key]
+
+def _state_key(path):
+    """Session state key for a data file, e.g. 'inventory' for data/inventory.parquet."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+def load_parquet(path):
+    """Loads a Parquet file, reusing the session's DataFrame until the file changes on disk."""
+    return get_state_df(_state_key(path), path)
+
+def loaded_mtime(path):
+    """The mtime of `path` when it was last loaded into this session, or None if not loaded yet."""
+    return st.session_state.get(_state_key(path) + "_mt")
+
+def save_parquet(df, path, schema=None):
+    """
+    Writes a DataFrame to Parquet and drops cached reads so the next load sees it.
+    With a `schema`, the DataFrame is converted to it first, so missing columns raise KeyError.
+    """
+    table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+    pq.write_table(table, path, compression="snappy")
+    _read_parquet.clear()
+
+def read_csv(source, schema=None):
+    """
+    Reads a CSV file path or uploaded file with Arrow's multithreaded CSV parser.
+    Columns in `schema` are parsed as the schema's types instead of being inferred.
+    """
+    read_options = pacsv.ReadOptions(use_threads=True)
+    convert_options = pacsv.ConvertOptions(
+        column_types={field.name: field.type for field in schema} if schema is not None else None
+    )
+    return pacsv.read_csv(
+        source, read_options=read_options, convert_options=convert_options
+    ).to_pandas()
+
+def migrate_csv(csv_path, parquet_path, schema=None):
+    """One-time conversion of a legacy CSV data file to Parquet. Returns True if converted."""
+    if os.path.exists(parquet_path) or not os.path.exists(csv_path):
+        return False
+    save_parquet(read_csv(csv_path, schema), parquet_path, schema)
+    return True
+
+def _write_fragment(table, path):
+    """
+    Writes an Arrow table as a new, uniquely named file in a dataset directory.
+    Names start with a timestamp so fragments are read back in insertion order.
+    """
+    fragment = os.path.join(path, f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.parquet")
+    pq.write_table(table, fragment, compression="snappy")
+    return fragment
+
+def _parse_dates(df, schema):
+    """Converts text dates (e.g. from CSV files) in the schema's timestamp columns."""
+    date_columns = [
+        field.name for field in schema
+        if pa.types.is_timestamp(field.type) and field.name in df.columns
+    ]
+    return df.assign(**{col: pd.to_datetime(df[col]) for col in date_columns})
+
+def load_dataset(path, schema):
+    """Loads a Parquet dataset directory, reusing the session's DataFrame until it changes on disk."""
+    return get_state_df(_state_key(path), path, schema)
+
+def save_dataset(df, path, schema):
+    """Replaces the contents of a Parquet dataset with a DataFrame (used for edits)."""
+    stale_fragments = glob.glob(os.path.join(path, "*.parquet"))
+    df = _parse_dates(df, schema)
+    _write_fragment(pa.Table.from_pandas(df, schema=schema, preserve_index=False), path)
+    for fragment in stale_fragments:
+        os.remove(fragment)
+    _read_parquet.clear()
+
+def append_row(path, row, schema):
+    """Appends a single row to a Parquet dataset as a new fragment, leaving existing rows untouched."""
+    # Built straight from the row dict; no one-row DataFrame is needed
+    _write_fragment(pa.Table.from_pylist([row], schema=schema), path)
+    _read_parquet.clear()
+
+def init_dataset(path, schema, legacy_files=()):
+    """
+    Creates an empty Parquet dataset, importing the first legacy CSV/Parquet data file found.
+    The import is written to a temporary directory that only replaces `path` once it has
+    succeeded, so a failed import leaves no half-initialised dataset and is retried next start.
+    """
+    if os.path.isdir(path):
+        return
+    staging_path = path + ".importing"
+    shutil.rmtree(staging_path, ignore_errors=True)
+    os.makedirs(staging_path)
+    try:
+        for legacy_file in legacy_files:
+            if os.path.exists(legacy_file):
+                if legacy_file.endswith(".csv"):
+                    legacy_df = read_csv(legacy_file, schema)
+                else:
+                    legacy_df = pd.read_parquet(legacy_file)
+                save_dataset(legacy_df, staging_path, schema)
+                break
+        os.replace(staging_path, path)
+    except Exception:
+        shutil.rmtree(staging_path, ignore_errors=True)
+        raise
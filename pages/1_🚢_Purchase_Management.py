@@ -2,7 +2,11 @@ import streamlit as st
 import pandas as pd
 import time
 from datetime import datetime
-import os
+from common import (
+    OIL_TYPES, inject_css, ensure_data_files, load_purchases, load_inventory, save_data,
+    append_purchase, recent_rows
+)
+from pricing import get_simulated_oil_prices
 
 # --- PAGE CONFIGURATION ---
 st.set_page_config(
@@ -11,78 +15,18 @@ st.set_page_config(
     layout="wide"
 )
 
-# --- MODERN UI STYLING (from app.py) ---
-st.markdown("""
-<style>
-    .stApp {
-        background-color: #f0f2f6;
-    }
-    .stMetric, .stDataFrame, [data-testid="stExpander"], [data-testid="stForm"] {
-        border-radius: 10px;
-        padding: 20px !important;
-        background-color: #ffffff;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-        border: 1px solid #e6e6e6;
-    }
-    h1, h2 {
-        color: #1a2a6c;
-    }
-    .stButton>button {
-        background-color: #1a2a6c;
-        color: white;
-        border-radius: 5px;
-        padding: 10px 20px;
-        border: none;
-        font-weight: bold;
-    }
-    .stButton>button:hover {
-        background-color: #293d8b;
-    }
-</style>
-""", unsafe_allow_html=True)
-
+inject_css()
+ensure_data_files()
 
-# --- DATA & CONSTANTS (Copied from app.py for consistency) ---
-OIL_DENSITIES = {
-    "Crude Degummed Oil": 0.92, "Palm Oil": 0.915,
-    "Palm Degummed": 0.918, "Crude Sunflower Oil": 0.922
-}
-OIL_TYPES = list(OIL_DENSITIES.keys())
+# --- PAGE CONSTANTS ---
 SHIPMENT_STATUSES = ["In Transit", "At Port", "Reached Factory"]
 
-# --- DATA FILE MANAGEMENT ---
-DATA_DIR = "data"
-PURCHASES_FILE = os.path.join(DATA_DIR, "purchases.csv")
-INVENTORY_FILE = os.path.join(DATA_DIR, "inventory.csv")
-
-# --- HELPER FUNCTIONS (from app.py) ---
-def load_data():
-    purchases_df = pd.read_csv(PURCHASES_FILE)
-    inventory_df = pd.read_csv(INVENTORY_FILE)
-    return purchases_df, inventory_df
-
-def save_data(purchases_df=None, inventory_df=None):
-    if purchases_df is not None:
-        purchases_df.to_csv(PURCHASES_FILE, index=False)
-    if inventory_df is not None:
-        inventory_df.to_csv(INVENTORY_FILE, index=False)
-
-def get_simulated_oil_prices():
-    day_of_year = time.localtime().tm_yday
-    base_price = 80000 + (day_of_year * 15)
-    prices = {
-        "Crude Degummed Oil": base_price, "Palm Oil": base_price - 5000,
-        "Palm Degummed": base_price - 4500, "Crude Sunflower Oil": base_price + 3000
-    }
-    previous_day_prices = {k: v * 0.99 for k, v in prices.items()}
-    return prices, previous_day_prices
-
 # --- PAGE UI ---
 st.title("🚢 Purchase & Shipment Management")
 st.markdown("Log new crude oil purchases and track their status until they arrive at the factory.")
 
 # Load data
-purchases, inventory = load_data()
+purchases, inventory = load_purchases(), load_inventory()
 _, prev_prices = get_simulated_oil_prices()
 
 # --- FORM TO ADD NEW PURCHASE ---
@@ -113,19 +57,20 @@ with st.form(key="new_purchase_form", clear_on_submit=True):
             total_cost = quantity_mt * price_per_mt
             shipment_id = f"SHP-{int(time.time())}" # Unique ID based on timestamp
             
-            new_purchase = pd.DataFrame([{
+            new_purchase = {
                 "ShipmentID": shipment_id,
                 "OilType": oil_type,
                 "QuantityMT": quantity_mt,
                 "PricePerMT": price_per_mt,
                 "TotalCost": total_cost,
-                "PurchaseDate": purchase_date.strftime("%Y-%m-%d"),
+                "PurchaseDate": pd.Timestamp(purchase_date),
                 "Status": "In Transit", # Default status
                 "Supplier": supplier
-            }])
+            }
             
-            purchases = pd.concat([purchases, new_purchase], ignore_index=True)
-            save_data(purchases_df=purchases)
+            # Append only the new row instead of rewriting the whole purchase log
+            append_purchase(new_purchase)
+            purchases = load_purchases()
             st.success(f"Successfully logged new shipment {shipment_id} from {supplier}.")
 
 
@@ -137,8 +82,8 @@ st.header("Current Shipments")
 if purchases.empty:
     st.info("No purchases logged yet. Use the form above to add your first shipment.")
 else:
-    # Create an editable copy of the dataframe for status updates
-    editable_purchases = purchases.copy()
+    # Create an editable copy of the (most recent) shipments for status updates
+    editable_purchases = recent_rows(purchases, "Shipments").copy()
     
     # Use st.data_editor to make the status column selectable
     edited_df = st.data_editor(
@@ -156,6 +101,10 @@ else:
             "PricePerMT": st.column_config.NumberColumn(
                 "Price per MT (INR)",
                 format="₹%,.2f"
+            ),
+            "PurchaseDate": st.column_config.DateColumn(
+                "Purchase Date",
+                format="YYYY-MM-DD"
             )
         },
         disabled=["ShipmentID", "OilType", "QuantityMT", "PricePerMT", "TotalCost", "PurchaseDate", "Supplier"],
@@ -163,28 +112,38 @@ else:
         key="purchase_editor"
     )
 
-    # Check for changes in the status
-    if not edited_df.equals(purchases):
-        # Find which rows were changed
-        for index, row in edited_df.iterrows():
-            original_status = purchases.at[index, 'Status']
-            new_status = row['Status']
-            
-            if original_status != new_status:
-                # Special logic for "Reached Factory"
-                if new_status == "Reached Factory" and original_status != "Reached Factory":
-                    oil_type = row['OilType']
-                    quantity = row['QuantityMT']
-                    
-                    # Update inventory
-                    inv_index = inventory.index[(inventory['OilType'] == oil_type) & (inventory['InventoryType'] == 'Crude')].tolist()
-                    if inv_index:
-                        inventory.loc[inv_index[0], 'QuantityMT'] += quantity
-                        st.success(f"Shipment {row['ShipmentID']}: Status updated. Added {quantity} MT of {oil_type} to Crude Inventory.")
-                    
-        # Save both dataframes
-        save_data(purchases_df=edited_df, inventory_df=inventory)
-        st.info("Changes saved! Refreshing...")
-        time.sleep(1) # Give user time to read the message
-        st.rerun()
+    # Only the status column is editable, so compare it directly instead of the whole frame
+    original_status = purchases.loc[edited_df.index, 'Status']
+    status_changed = edited_df['Status'].ne(original_status) & edited_df['Status'].notna()
+    if status_changed.any():
+        # Special logic for shipments that have just "Reached Factory"
+        just_arrived = edited_df[
+            status_changed
+            & edited_df['Status'].eq("Reached Factory")
+            & original_status.ne("Reached Factory")
+        ]
+        # Only oils with a crude inventory row can be stocked; the rest are reported and skipped
+        inventory = inventory.set_index(['OilType', 'InventoryType'])
+        stocked = just_arrived['OilType'].isin(inventory.xs('Crude', level='InventoryType').index)
+        for shipment in just_arrived[~stocked].itertuples():
+            st.warning(f"Shipment {shipment.ShipmentID}: Status updated, but there is no Crude Inventory entry for {shipment.OilType}, so no stock was added.")
+        arrived = just_arrived[stocked]
+        if not arrived.empty:
+            # Add all arrived quantities to crude inventory in one aligned update
+            crude_added = arrived.groupby('OilType', observed=True)['QuantityMT'].sum()
+            crude_added.index = pd.MultiIndex.from_product(
+                [crude_added.index, ['Crude']], names=inventory.index.names
+            )
+            inventory['QuantityMT'] += crude_added.reindex(inventory.index, fill_value=0.0)
+            for shipment in arrived.itertuples():
+                st.toast(f"Shipment {shipment.ShipmentID}: Status updated. Added {shipment.QuantityMT} MT of {shipment.OilType} to Crude Inventory.", icon="✅")
+
+        # Write the edited statuses back into the full purchase log
+        updated_purchases = purchases.copy()
+        updated_purchases.loc[edited_df.index, 'Status'] = edited_df['Status']
+
+        # Save purchases, and inventory if any stock arrived
+        save_data(purchases_df=updated_purchases, inventory_df=None if arrived.empty else inventory.reset_index())
+        # The editor already shows the new statuses, so no rerun is needed
+        st.toast("Changes saved!", icon="✅")
 
@@ -1,7 +1,8 @@
 import streamlit as st
-import pandas as pd
-import os
-import time
+from common import (
+    OIL_TYPES, inject_css, ensure_data_files, show_pending_toasts, toast_after_rerun,
+    load_inventory, inventory_mtime, save_data
+)
 
 # --- PAGE CONFIGURATION ---
 st.set_page_config(
@@ -10,61 +11,17 @@ st.set_page_config(
     layout="wide"
 )
 
-# --- MODERN UI STYLING (from app.py) ---
-st.markdown("""
-<style>
-    .stApp {
-        background-color: #f0f2f6;
-    }
-    .stMetric, .stDataFrame, [data-testid="stExpander"], [data-testid="stForm"] {
-        border-radius: 10px;
-        padding: 20px !important;
-        background-color: #ffffff;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-        border: 1px solid #e6e6e6;
-    }
-    h1, h2 {
-        color: #1a2a6c;
-    }
-    .stButton>button {
-        background-color: #1a2a6c;
-        color: white;
-        border-radius: 5px;
-        padding: 10px 20px;
-        border: none;
-        font-weight: bold;
-    }
-    .stButton>button:hover {
-        background-color: #293d8b;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# --- DATA & CONSTANTS ---
-OIL_DENSITIES = {
-    "Crude Degummed Oil": 0.92, "Palm Oil": 0.915,
-    "Palm Degummed": 0.918, "Crude Sunflower Oil": 0.922
-}
-OIL_TYPES = list(OIL_DENSITIES.keys())
-
-# --- DATA FILE MANAGEMENT ---
-DATA_DIR = "data"
-INVENTORY_FILE = os.path.join(DATA_DIR, "inventory.csv")
-
-# --- HELPER FUNCTIONS ---
-def load_inventory():
-    """Loads the inventory data from the CSV file."""
-    return pd.read_csv(INVENTORY_FILE)
-
-def save_inventory(inventory_df):
-    """Saves the inventory DataFrame back to the CSV file."""
-    inventory_df.to_csv(INVENTORY_FILE, index=False)
+inject_css()
+ensure_data_files()
+show_pending_toasts()
 
 # --- PAGE UI ---
 st.title("🏭 Inventory & Refining Management")
 st.markdown("View your current stock levels and manage the oil refining process.")
 
 inventory_df = load_inventory()
+# Index by (OilType, InventoryType) once so stock lookups are direct index hits
+inventory = inventory_df.set_index(['OilType', 'InventoryType']).sort_index()
 
 # --- REFINING MODULE ---
 st.header("Refining Module")
@@ -75,12 +32,13 @@ with col1:
         st.subheader("Start a New Refining Batch")
         
         # Get current crude stock to display in the selectbox
-        crude_inventory = inventory_df[inventory_df['InventoryType'] == 'Crude'].set_index('OilType')
+        crude_inventory = inventory.xs('Crude', level='InventoryType')
         
         # Create labels with stock info
+        available_qty = crude_inventory['QuantityMT'].reindex(OIL_TYPES).to_numpy()
         oil_options_labels = [
-            f"{oil_type} (Available: {crude_inventory.loc[oil_type, 'QuantityMT']:.2f} MT)"
-            for oil_type in OIL_TYPES
+            f"{oil_type} (Available: {qty:.2f} MT)"
+            for oil_type, qty in zip(OIL_TYPES, available_qty)
         ]
         
         selected_label = st.selectbox("Select Oil to Refine", options=oil_options_labels)
@@ -106,34 +64,53 @@ with col1:
             elif quantity_to_refine > max_refine_qty:
                 st.error(f"Cannot refine {quantity_to_refine} MT. Only {max_refine_qty:.2f} MT of {oil_to_refine} is available.")
             else:
-                # Proceed with refining logic
-                # Get index for crude oil
-                crude_idx = inventory_df[(inventory_df['OilType'] == oil_to_refine) & (inventory_df['InventoryType'] == 'Crude')].index[0]
-                # Get index for refined oil
-                refined_idx = inventory_df[(inventory_df['OilType'] == oil_to_refine) & (inventory_df['InventoryType'] == 'Refined')].index[0]
+                # Proceed with refining logic: move stock from crude to refined
+                inventory.loc[(oil_to_refine, 'Crude'), 'QuantityMT'] -= quantity_to_refine
+                inventory.loc[(oil_to_refine, 'Refined'), 'QuantityMT'] += quantity_to_refine
                 
-                # Update quantities
-                inventory_df.loc[crude_idx, 'QuantityMT'] -= quantity_to_refine
-                inventory_df.loc[refined_idx, 'QuantityMT'] += quantity_to_refine
+                save_data(inventory_df=inventory.reset_index())
                 
-                save_inventory(inventory_df)
-                
-                st.success(f"Successfully refined {quantity_to_refine:.2f} MT of {oil_to_refine}. Inventory updated.")
-                time.sleep(1) # Pause to let user read the message
+                # Rerun so the stock labels and table pick up the saved inventory
+                toast_after_rerun(f"Successfully refined {quantity_to_refine:.2f} MT of {oil_to_refine}. Inventory updated.")
                 st.rerun()
 
 with col2:
     # --- INVENTORY DISPLAY ---
     st.subheader("Current Stock Levels (MT)")
     
-    # Pivot the table for a more readable side-by-side view
-    inventory_pivot = inventory_df.pivot(index='OilType', columns='InventoryType', values='QuantityMT')
-    inventory_pivot = inventory_pivot[['Crude', 'Refined']] # Ensure column order
+    # Side-by-side view of crude and refined stock, kept per session and
+    # rebuilt only when the inventory file changes
+    mtime = inventory_mtime()
+    if st.session_state.get('inventory_pivot_mt') != mtime:
+        st.session_state['inventory_pivot'] = (
+            inventory['QuantityMT'].unstack('InventoryType').reindex(columns=['Crude', 'Refined'])
+        )
+        st.session_state['inventory_pivot_mt'] = mtime
+    inventory_pivot = st.session_state['inventory_pivot']
     
+    # Plain number formatting instead of a pandas Styler, which is slow to render
     st.dataframe(
-        inventory_pivot.style.format("{:.2f}").highlight_max(axis=0, color='#d4edda').highlight_min(axis=0, color='#f8d7da'),
-        use_container_width=True
+        inventory_pivot,
+        use_container_width=True,
+        column_config={
+            col: st.column_config.NumberColumn(col, format="%.2f MT")
+            for col in inventory_pivot.columns
+        }
     )
+    
+    # Highest and lowest stock per inventory type, shown below the table.
+    # Skipped when every oil has the same stock, where the pick would be arbitrary.
+    highest_stock = inventory_pivot.idxmax()
+    lowest_stock = inventory_pivot.idxmin()
+    for inventory_type in inventory_pivot.columns:
+        if inventory_pivot[inventory_type].max() == inventory_pivot[inventory_type].min():
+            continue
+        st.caption(
+            f"**{inventory_type}** — highest: {highest_stock[inventory_type]} "
+            f"({inventory_pivot.loc[highest_stock[inventory_type], inventory_type]:.2f} MT), "
+            f"lowest: {lowest_stock[inventory_type]} "
+            f"({inventory_pivot.loc[lowest_stock[inventory_type], inventory_type]:.2f} MT)"
+        )
 
 st.markdown("<hr>", unsafe_allow_html=True)
 st.info("The table on the right shows your current inventory. Use the module on the left to convert 'Crude' stock into 'Refined' stock.")
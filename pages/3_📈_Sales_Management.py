@@ -1,8 +1,12 @@
 import streamlit as st
 import pandas as pd
-import os
 import time
 from datetime import datetime
+from common import (
+    OIL_TYPES, inject_css, ensure_data_files, show_pending_toasts, toast_after_rerun,
+    load_sales, load_inventory, save_data, append_sale, recent_rows
+)
+from pricing import calculate_sale_price
 
 # --- PAGE CONFIGURATION ---
 st.set_page_config(
@@ -11,102 +15,20 @@ st.set_page_config(
     layout="wide"
 )
 
-# --- MODERN UI STYLING (from app.py) ---
-st.markdown("""
-<style>
-    .stApp {
-        background-color: #f0f2f6;
-    }
-    .stMetric, .stDataFrame, [data-testid="stExpander"], [data-testid="stForm"] {
-        border-radius: 10px;
-        padding: 20px !important;
-        background-color: #ffffff;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-        border: 1px solid #e6e6e6;
-    }
-    h1, h2, h3 {
-        color: #1a2a6c;
-    }
-    .stButton>button {
-        background-color: #1a2a6c;
-        color: white;
-        border-radius: 5px;
-        padding: 10px 20px;
-        border: none;
-        font-weight: bold;
-    }
-    .stButton>button:hover {
-        background-color: #293d8b;
-    }
-    .price-display {
-        background-color: #e6f7ff;
-        border-left: 5px solid #1a2a6c;
-        padding: 15px;
-        border-radius: 5px;
-        margin-top: 10px;
-    }
-</style>
-""", unsafe_allow_html=True)
-
+inject_css()
+ensure_data_files()
+show_pending_toasts()
 
-# --- DATA & CONSTANTS ---
-OIL_DENSITIES = {
-    "Crude Degummed Oil": 0.92, "Palm Oil": 0.915,
-    "Palm Degummed": 0.918, "Crude Sunflower Oil": 0.922
-}
-OIL_TYPES = list(OIL_DENSITIES.keys())
-TRANSPORT_COST_PER_KM = 12
-IGST_RATE = 0.05 # 5%
+# --- PAGE CONSTANTS ---
 ORDER_STATUSES = ["Under Process", "Confirmed", "Dispatched", "Fulfilled"]
 
-
-# --- DATA FILE MANAGEMENT ---
-DATA_DIR = "data"
-SALES_FILE = os.path.join(DATA_DIR, "sales.csv")
-INVENTORY_FILE = os.path.join(DATA_DIR, "inventory.csv")
-
-# --- HELPER FUNCTIONS ---
-def load_data():
-    sales_df = pd.read_csv(SALES_FILE)
-    inventory_df = pd.read_csv(INVENTORY_FILE)
-    return sales_df, inventory_df
-
-def save_data(sales_df=None, inventory_df=None):
-    if sales_df is not None:
-        sales_df.to_csv(SALES_FILE, index=False)
-    if inventory_df is not None:
-        inventory_df.to_csv(INVENTORY_FILE, index=False)
-
-def get_simulated_oil_prices():
-    day_of_year = time.localtime().tm_yday
-    base_price = 80000 + (day_of_year * 15)
-    prices = {
-        "Crude Degummed Oil": base_price, "Palm Oil": base_price - 5000,
-        "Palm Degummed": base_price - 4500, "Crude Sunflower Oil": base_price + 3000
-    }
-    return prices, {k: v * 0.99 for k, v in prices.items()}
-
-def calculate_sale_price(oil_type, quantity_mt, distance_km):
-    if quantity_mt <= 0: return 0, 0
-    current_prices, _ = get_simulated_oil_prices()
-    density = OIL_DENSITIES[oil_type]
-    base_oil_price = current_prices[oil_type] * quantity_mt
-    quantity_litres = (quantity_mt * 1000) / density
-    premium_cost = quantity_litres * 10
-    transport_cost = distance_km * TRANSPORT_COST_PER_KM
-    sub_total = base_oil_price + premium_cost + transport_cost
-    gst_amount = sub_total * IGST_RATE
-    total_price = sub_total + gst_amount
-    final_price = round(total_price)
-    price_per_lt = round(final_price / quantity_litres, 2) if quantity_litres > 0 else 0
-    return final_price, price_per_lt
-
-
 # --- PAGE UI ---
 st.title("📈 Sales & Order Management")
 st.markdown("Create new sales orders and track their fulfillment status.")
 
-sales, inventory = load_data()
+sales, inventory = load_sales(), load_inventory()
+# Index by (OilType, InventoryType) once so stock lookups are direct index hits
+inventory = inventory.set_index(['OilType', 'InventoryType']).sort_index()
 
 # --- FORM TO CREATE NEW SALE ---
 st.header("Create a New Sales Order")
@@ -119,10 +41,11 @@ with st.form(key="new_sale_form"):
         distance_km = st.number_input("Distance to Destination (KM)", min_value=0, step=10)
 
     with col2:
-        refined_inventory = inventory[inventory['InventoryType'] == 'Refined'].set_index('OilType')
+        refined_inventory = inventory.xs('Refined', level='InventoryType')
+        available_qty = refined_inventory['QuantityMT'].reindex(OIL_TYPES).to_numpy()
         oil_options_labels = [
-            f"{oil_type} (Available: {refined_inventory.loc[oil_type, 'QuantityMT']:.2f} MT)"
-            for oil_type in OIL_TYPES
+            f"{oil_type} (Available: {qty:.2f} MT)"
+            for oil_type, qty in zip(OIL_TYPES, available_qty)
         ]
         selected_label = st.selectbox("Select Oil Type", options=oil_options_labels)
         oil_type = selected_label.split(" (")[0]
@@ -130,18 +53,28 @@ with st.form(key="new_sale_form"):
         quantity_mt = st.number_input("Quantity to Sell (MT)", min_value=0.1, step=0.1, format="%.2f")
         order_date = st.date_input("Order Date", datetime.now())
 
-    # --- DYNAMIC PRICE PREVIEW ---
-    final_price, price_per_lt = calculate_sale_price(oil_type, quantity_mt, distance_km)
+    # --- PRICE PREVIEW ---
+    # Form inputs don't rerun the script, so the price is only recalculated
+    # when "Preview Price" or "Book Order" is pressed
     st.markdown("### Price Calculation Preview")
-    st.markdown(
+    preview_container = st.container()
+    
+    preview_col, submit_col = st.columns(2)
+    with preview_col:
+        preview_button = st.form_submit_button(label="Preview Price", type="secondary")
+    with submit_col:
+        submit_button = st.form_submit_button(label="Book Order")
+
+    if preview_button or submit_button:
+        st.session_state['sale_price_preview'] = calculate_sale_price(oil_type, quantity_mt, distance_km)
+    final_price, price_per_lt = st.session_state.get('sale_price_preview', (0, 0))
+    preview_container.markdown(
         f"""
         <div class="price-display">
             <strong>Total Sale Price:</strong> ₹ {final_price:,.2f}<br>
             <strong>Price per Litre:</strong> ₹ {price_per_lt:,.2f}
         </div>
         """, unsafe_allow_html=True)
-    
-    submit_button = st.form_submit_button(label="Book Order")
 
     if submit_button:
         if not vendor_name or not destination or quantity_mt <= 0 or distance_km <= 0:
@@ -153,24 +86,23 @@ with st.form(key="new_sale_form"):
             if quantity_mt > available_stock:
                 # Not enough stock, order is under process
                 status = "Under Process"
-                st.warning(f"⚠️ Order booked as 'Under Process'. Not enough refined stock ({available_stock:.2f} MT) for {oil_type}. Please refine more.")
+                toast_after_rerun(f"Order booked as 'Under Process'. Not enough refined stock ({available_stock:.2f} MT) for {oil_type}. Please refine more.", icon="⚠️")
             else:
                 # Enough stock, confirm the order and deduct from inventory
                 status = "Confirmed"
-                refined_idx = inventory[(inventory['OilType'] == oil_type) & (inventory['InventoryType'] == 'Refined')].index[0]
-                inventory.loc[refined_idx, 'QuantityMT'] -= quantity_mt
-                save_data(inventory_df=inventory)
-                st.success(f"✅ Order {order_id} Confirmed! {quantity_mt:.2f} MT of {oil_type} deducted from refined inventory.")
+                inventory.loc[(oil_type, 'Refined'), 'QuantityMT'] -= quantity_mt
+                save_data(inventory_df=inventory.reset_index())
+                toast_after_rerun(f"Order {order_id} Confirmed! {quantity_mt:.2f} MT of {oil_type} deducted from refined inventory.")
 
-            new_sale = pd.DataFrame([{
+            new_sale = {
                 "OrderID": order_id, "VendorName": vendor_name, "Destination": destination,
                 "DistanceKM": distance_km, "OilType": oil_type, "QuantityMT": quantity_mt,
-                "SalePrice": final_price, "OrderDate": order_date.strftime("%Y-%m-%d"), "Status": status
-            }])
+                "SalePrice": final_price, "OrderDate": pd.Timestamp(order_date), "Status": status
+            }
             
-            sales = pd.concat([sales, new_sale], ignore_index=True)
-            save_data(sales_df=sales)
-            time.sleep(2)
+            # Append only the new row instead of rewriting the whole sales log
+            append_sale(new_sale)
+            # Rerun so the stock labels and the orders table pick up the new order
             st.rerun()
 
 st.markdown("<hr>", unsafe_allow_html=True)
@@ -180,19 +112,25 @@ st.header("All Sales Orders")
 if sales.empty:
     st.info("No sales orders yet. Use the form above to create one.")
 else:
+    # Large order books are trimmed to their most recent orders
+    shown_sales = recent_rows(sales, "Orders")
     edited_sales = st.data_editor(
-        sales,
+        shown_sales,
         column_config={
             "Status": st.column_config.SelectboxColumn("Order Status", options=ORDER_STATUSES, required=True),
-            "SalePrice": st.column_config.NumberColumn("Total Sale Price (INR)", format="₹%,.2f")
+            "SalePrice": st.column_config.NumberColumn("Total Sale Price (INR)", format="₹%,.2f"),
+            "OrderDate": st.column_config.DateColumn("Order Date", format="YYYY-MM-DD")
         },
         disabled=list(sales.columns.drop("Status")),
         use_container_width=True,
         key="sales_editor"
     )
     
-    if not edited_sales.equals(sales):
-        save_data(sales_df=edited_sales)
-        st.toast("Order status updated!")
-        time.sleep(1)
-        st.rerun()
+    # Only the status column is editable, so compare it directly instead of the whole frame
+    if (edited_sales['Status'].ne(shown_sales['Status']) & edited_sales['Status'].notna()).any():
+        # Write the edited statuses back into the full sales log
+        updated_sales = sales.copy()
+        updated_sales.loc[edited_sales.index, 'Status'] = edited_sales['Status']
+        save_data(sales_df=updated_sales)
+        # The editor already shows the new statuses, so no rerun is needed
+        st.toast("Order status updated!", icon="✅")
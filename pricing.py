@@ -0,0 +1,70 @@
+import time
+
+import numpy as np
+import streamlit as st
+
+from common import OIL_DENSITIES, TRANSPORT_COST_PER_KM, IGST_RATE
+
+
+# --- MARKET PRICES (shared by app.py and all pages) ---
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _simulated_oil_prices(day_of_year):
+    """Builds the simulated price tables for a given day of the year."""
+    base_price = 80000 + (day_of_year * 15)
+    
+    prices = {
+        "Crude Degummed Oil": base_price,
+        "Palm Oil": base_price - 5000,
+        "Palm Degummed": base_price - 4500,
+        "Crude Sunflower Oil": base_price + 3000
+    }
+    
+    previous_day_prices = {k: v * 0.99 for k, v in prices.items()}
+    return prices, previous_day_prices
+
+def get_simulated_oil_prices():
+    """
+    Simulates current and previous day's crude oil prices per MT.
+    In a real app, this would be an API call.
+    Prices only change once a day, so they are cached per day of the year.
+    """
+    return _simulated_oil_prices(time.localtime().tm_yday)
+
+def calculate_sale_prices(oil_types, quantities_mt, distances_km):
+    """
+    Vectorised version of calculate_sale_price() for many orders at once,
+    e.g. to reprice a whole order book. Returns arrays of final prices and prices per litre.
+    """
+    current_prices, _ = get_simulated_oil_prices()
+    quantities_mt = np.asarray(quantities_mt, dtype=float)
+    distances_km = np.asarray(distances_km, dtype=float)
+    prices = np.array([current_prices[oil] for oil in oil_types], dtype=float)
+    densities = np.array([OIL_DENSITIES[oil] for oil in oil_types], dtype=float)
+    valid = quantities_mt > 0
+    
+    base_oil_price = prices * quantities_mt
+    quantity_litres = (quantities_mt * 1000) / densities
+    premium_cost = quantity_litres * 10
+    transport_cost = distances_km * TRANSPORT_COST_PER_KM
+    sub_total = base_oil_price + premium_cost + transport_cost
+    gst_amount = sub_total * IGST_RATE
+    total_price = sub_total + gst_amount
+    
+    final_price = np.where(valid, np.round(total_price), 0)
+    price_per_lt = np.where(valid, np.round(final_price / np.where(valid, quantity_litres, 1), 2), 0)
+    
+    return final_price, price_per_lt
+
+@st.cache_data(max_entries=1000, show_spinner=False)
+def _cached_sale_price(oil_type, quantity_mt, distance_km, day_of_year):
+    """Single-order sale price, cached per input and day (prices change daily)."""
+    final_price, price_per_lt = calculate_sale_prices([oil_type], [quantity_mt], [distance_km])
+    return int(final_price[0]), float(price_per_lt[0])
+
+def calculate_sale_price(oil_type, quantity_mt, distance_km):
+    """
+    Calculates the final sale price based on current market rates,
+    transport, premium, and taxes.
+    """
+    return _cached_sale_price(oil_type, quantity_mt, distance_km, time.localtime().tm_yday)